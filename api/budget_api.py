@@ -1,6 +1,4 @@
-from flask import Blueprint, request, jsonify
-import pandas as pd
-import traceback
+from flask import Blueprint, current_app, request, jsonify
 from enhanced_budget import EnhancedRepairFinancials, BudgetOptimizationError
 from data_converter import get_conversion_stats, batch_convert_reports
 
@@ -25,8 +23,7 @@ def optimize_budget():
         repair_objects = []
         for repair_data in enhanced_repairs:
             try:
-                df = pd.DataFrame([repair_data])
-                repair_obj = EnhancedRepairFinancials(df)
+                repair_obj = EnhancedRepairFinancials.from_record(repair_data)
                 repair_objects.append((repair_data.get("tracking_number"), repair_obj))
             except Exception:
                 continue
@@ -58,7 +55,7 @@ def optimize_budget():
         }), 200
     
     except Exception as e:
-        print(f"Budget Error: {e}")
+        current_app.logger.exception("Budget optimization failed")
         return jsonify({"success": False, "error": str(e)}), 500
 
 def create_budget_app(app=None):
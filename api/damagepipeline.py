@@ -1,4 +1,6 @@
 import requests
+import orjson
+from requests.adapters import HTTPAdapter
 import base64
 import time
 import logging
@@ -17,11 +19,19 @@ ROBOFLOW_API_KEY = os.environ.get("ROBOFLOW_API_KEY", "YOUR_PRIVATE_API_KEY_HERE
 
 # USING GROUP12 POTHOLE MODEL (High Accuracy for Potholes)
 MODEL_ID = "pothole-detection-bnahf/1" 
+# We can use a higher confidence (40-50%) because this model is accurate
+INFERENCE_URL = f"https://detect.roboflow.com/{MODEL_ID}?api_key={ROBOFLOW_API_KEY}&confidence=40"
 
 class RoadDamagePipeline:
     def __init__(self, road_classifier_path=None, yolo_model_path=None):
         print(f"🚀 Initialized Roboflow Cloud Pipeline (Model: {MODEL_ID})")
         print("   (Specialized Pothole Detection Model - High mAP)")
+        self.model_id = MODEL_ID
+        # One session per pipeline: keep-alive reuses the TLS connection to Roboflow
+        # instead of a new handshake for every report
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+        self.session.headers.update({"Content-Type": "application/x-www-form-urlencoded"})
     
     def map_class_to_system(self, roboflow_class):
         """
@@ -32,7 +42,7 @@ class RoadDamagePipeline:
         # But regardless of what it calls it, we know it's a pothole.
         return 'pothole'
 
-    def analyze_image(self, image_path):
+    def analyze_image(self, image_path, image_data=None):
         analysis_start_time = time.time()
         
         result = {
@@ -51,16 +61,14 @@ class RoadDamagePipeline:
         
         try:
             # 1. Encode image to base64 for API
-            with open(image_path, "rb") as img_file:
-                img_data = base64.b64encode(img_file.read()).decode("utf-8")
+            # Kept as bytes: decoding to str only to have requests encode it back is two extra copies
+            if image_data is None:
+                with open(image_path, "rb") as img_file:
+                    image_data = img_file.read()
+            img_data = base64.b64encode(image_data)
 
             # 2. Call Roboflow Inference API
-            # We can use a higher confidence (40-50%) because this model is accurate
-            url = f"https://detect.roboflow.com/{MODEL_ID}?api_key={ROBOFLOW_API_KEY}&confidence=40"
-            
-            response = requests.post(url, data=img_data, headers={
-                "Content-Type": "application/x-www-form-urlencoded"
-            })
+            response = self.session.post(INFERENCE_URL, data=img_data, timeout=(5, 60))
 
             if response.status_code != 200:
                 logger.error(f"Roboflow API Error: {response.text}")
@@ -69,7 +77,7 @@ class RoadDamagePipeline:
                 result['status'] = 'completed' 
                 return result
 
-            predictions = response.json().get('predictions', [])
+            predictions = orjson.loads(response.content).get('predictions', [])
             
             # 3. Map Roboflow output to System Format
             detections = []
@@ -167,7 +175,7 @@ class LocalRoadDamagePipeline:
         self.severity_calculator = DamageSeverityCalculator()
         print(f"Local Pipeline initialized on {self.device}")
 
-    def analyze_image(self, image_path):
+    def analyze_image(self, image_path, image_data=None):
         # ... (Previous local analysis logic) ...
         pass
 """
\ No newline at end of file
@@ -25,9 +25,10 @@ def database_report_to_budget_format(report: Dict[str, Any]) -> Dict[str, Any]:
         urgency = "routine"
     
     # Estimate dimensions based on type (Heuristics)
-    if "crack" in str(damage_type).lower():
+    damage_key = str(damage_type).lower()
+    if "crack" in damage_key:
         length, breadth, depth = 150, 100, 8
-    elif "pothole" in str(damage_type).lower():
+    elif "pothole" in damage_key:
         length, breadth, depth = 100, 80, 15
     else:
         length, breadth, depth = 80, 60, 10
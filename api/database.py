@@ -1,14 +1,23 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_marshmallow import Marshmallow
-from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.security import check_password_hash
+from argon2 import PasswordHasher
+from argon2.exceptions import VerificationError, InvalidHashError
 from datetime import datetime
 
 # Initialize extensions
 db = SQLAlchemy()
 ma = Marshmallow()
 
+# Password hashing (argon2id)
+_PH = PasswordHasher(time_cost=2, memory_cost=65536, parallelism=2)
+
 class Report(db.Model):
     __tablename__ = 'reports'
+    __table_args__ = (
+        # Newest-first admin listing and its keyset pagination
+        db.Index('ix_reports_created_at_id', 'created_at', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     tracking_number = db.Column(db.String(50), unique=True, nullable=False)
@@ -53,11 +62,27 @@ class AdminUser(db.Model):
     role = db.Column(db.String(50), default='administrator', nullable=False)
     
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = _PH.hash(password)
         
     def check_password(self, password):
+        if self.password_hash.startswith('$argon2'):
+            try:
+                return _PH.verify(self.password_hash, password)
+            except (VerificationError, InvalidHashError):
+                return False
+        # Hashes created by werkzeug before the switch to argon2
         return check_password_hash(self.password_hash, password)
 
+    def password_needs_rehash(self):
+        return not self.password_hash.startswith('$argon2') or _PH.check_needs_rehash(self.password_hash)
+
+class AnalysisCache(db.Model):
+    __tablename__ = 'analysis_cache'
+    # Detection results keyed by a hash of the image bytes, so a re-submitted photo skips the AI call
+    image_hash = db.Column(db.String(32), primary_key=True)
+    result = db.Column(db.JSON, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
 class ReportSchema(ma.SQLAlchemyAutoSchema):
     class Meta:
         model = Report
@@ -21,13 +21,31 @@ class BudgetOptimizationError(Exception): pass
 
 class EnhancedRepairFinancials:
     def __init__(self, df: pd.DataFrame, config: Optional[BudgetConfig] = None):
+        self._setup(
+            df["length_cm"].values[0] if isinstance(df["length_cm"], pd.Series) else df["length_cm"],
+            df["breadth_cm"].values[0] if isinstance(df["breadth_cm"], pd.Series) else df["breadth_cm"],
+            df["depth_cm"].values[0] if isinstance(df["depth_cm"], pd.Series) else df["depth_cm"],
+            df["severity"].values[0] if isinstance(df["severity"], pd.Series) else df["severity"],
+            df["urgency"].values[0] if "urgency" in df.columns and isinstance(df["urgency"], pd.Series) else "routine",
+            config
+        )
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any], config: Optional[BudgetConfig] = None):
+        """Build from one converted report dict without wrapping it in a one-row DataFrame."""
+        obj = cls.__new__(cls)
+        obj._setup(record["length_cm"], record["breadth_cm"], record["depth_cm"], record["severity"],
+                   record.get("urgency", "routine"), config)
+        return obj
+
+    def _setup(self, length, breadth, depth, severity, urgency, config: Optional[BudgetConfig]):
+        """Field setup shared by both constructors."""
         self.config = config or BudgetConfig()
-        self.length = df["length_cm"].values[0] if isinstance(df["length_cm"], pd.Series) else df["length_cm"]
-        self.breadth = df["breadth_cm"].values[0] if isinstance(df["breadth_cm"], pd.Series) else df["breadth_cm"]
-        self.depth = df["depth_cm"].values[0] if isinstance(df["depth_cm"], pd.Series) else df["depth_cm"]
-        self.severity = df["severity"].values[0] if isinstance(df["severity"], pd.Series) else df["severity"]
-        self.urgency = df["urgency"].values[0] if "urgency" in df.columns and isinstance(df["urgency"], pd.Series) else "routine"
-        
+        self.length = length
+        self.breadth = breadth
+        self.depth = depth
+        self.severity = severity
+        self.urgency = urgency
         self.cost_estimation_data = self._cost_estimation()
         self.priority_score = self._calculate_priority_score()
 
@@ -1,33 +1,73 @@
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, request, jsonify, send_from_directory, stream_with_context
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
-from flask_jwt_extended import create_access_token, JWTManager, jwt_required
+from flask_jwt_extended import create_access_token, jwt_required
 from flask_sqlalchemy import SQLAlchemy
 from flask_marshmallow import Marshmallow
 import os
-import uuid
+import secrets
+import time
 import sys
 import threading
-import base64
+import binascii
 import io
+import logging
 import gc
+import hashlib
 import cv2
 import numpy as np
 import math
-from datetime import datetime
+import mimetypes
+import orjson
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from types import MappingProxyType
+from werkzeug.exceptions import RequestEntityTooLarge
 from werkzeug.utils import secure_filename
-from PIL import Image
+from PIL import Image, ImageOps
+from cachetools import TTLCache
+from sqlalchemy import case, delete, event, func, select, text, tuple_, update
+from sqlalchemy.exc import IntegrityError
 
 # --- CONFIGURATION ---
 BASE_URL = os.environ.get('RENDER_EXTERNAL_URL') or os.environ.get('VERCEL_URL') 
 if not BASE_URL:
     BASE_URL = 'http://localhost:5000' 
+_UPLOAD_PREFIX = f"{BASE_URL}/api/uploads/"
+
+# --- LOGGING ---
+# Configured before the app (and the AI pipeline) so there is one root handler; LOG_LEVEL=DEBUG
+# shows per-report progress, the default INFO keeps urllib3's per-request debug lines out
+LOG_LEVEL = (os.environ.get('LOG_LEVEL') or 'INFO').upper()
+_log_level_known = isinstance(logging.getLevelName(LOG_LEVEL), int)
+logging.basicConfig(level=LOG_LEVEL if _log_level_known else logging.INFO, format='%(levelname)s - %(name)s - %(message)s')
+if not _log_level_known: logging.getLogger(__name__).warning("Unknown LOG_LEVEL %r, using INFO", LOG_LEVEL)
 
 app = Flask(__name__)
 
+# --- JSON CONFIG ---
+# jsonify() and request.get_json() go through orjson instead of the stdlib json module.
+# OPT_NON_STR_KEYS keeps the stdlib behaviour of stringifying int/float dict keys (e.g. budget allocations keyed by tracking number)
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+class ORJSONProvider(JSONProvider):
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=ORJSON_OPTIONS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+app.json = ORJSONProvider(app)
+
 # --- JWT CONFIG ---
 app.config["JWT_SECRET_KEY"] = os.environ.get("JWT_SECRET_KEY", "fallback-secret-key") 
 app.config["JWT_TOKEN_LOCATION"] = ["headers"]
-jwt = JWTManager(app)
+try:
+    from jwt_cache import CachingJWTManager
+except ImportError:
+    from api.jwt_cache import CachingJWTManager
+jwt = CachingJWTManager(app)
 
 # --- CORS CONFIG ---
 CORS(app, resources={
@@ -41,7 +81,9 @@ CORS(app, resources={
         ],
         "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"],
         "allow_headers": ["Content-Type", "Authorization"],
-        "supports_credentials": True
+        "supports_credentials": True,
+        # Let browsers reuse a preflight for a day instead of sending OPTIONS before every admin call
+        "max_age": 86400
     }
 })
 
@@ -51,22 +93,48 @@ if not DATABASE_URL:
     print("Using local SQLite fallback")
     DATABASE_URL = 'sqlite:///road_reports.db'
 
+_IS_PG = DATABASE_URL.startswith('postgres')
+
 app.config['SQLALCHEMY_DATABASE_URI'] = DATABASE_URL
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# db.JSON columns (analysis_cache.result) are encoded/decoded with orjson too
 app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
-    "pool_pre_ping": True,
-    "pool_recycle": 300,
-    "pool_size": 10,
-    "max_overflow": 20,
+    "json_serializer": lambda obj: orjson.dumps(obj, option=ORJSON_OPTIONS).decode(),
+    "json_deserializer": orjson.loads,
 }
+# Threads that can hold a connection at once in this process: gunicorn request threads + AI workers
+GUNICORN_THREADS = max(1, int(os.environ.get('GUNICORN_THREADS', 4)))
+AI_WORKERS = max(1, int(os.environ.get('AI_WORKERS', 2)))
+if not DATABASE_URL.startswith('sqlite'):
+    # One warm connection per thread; the small overflow only covers streamed admin lists
+    # still holding a connection while the next request starts
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'].update({
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,
+        "pool_size": GUNICORN_THREADS + AI_WORKERS,
+        "max_overflow": 2,
+        "pool_timeout": 10,
+    })
+else:
+    # Local SQLite: WAL lets the AI worker write while admin reads continue, and
+    # synchronous=NORMAL skips the fsync on every commit (still safe in WAL mode).
+    # Registered on the app's engine only (below, after db.init_app), not on every Engine in the process
+    def _sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        # Keep sort/group temp data in memory and give each pooled connection a 20MB page cache
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-20000")
+        cursor.close()
 
 # --- IMPORT DATABASE MODELS ---
 try:
-    from database import db, ma, Report, ReportSchema, AdminUser
+    from database import db, ma, Report, ReportSchema, AdminUser, AnalysisCache
     print("Database models imported locally")
 except ImportError:
     try:
-        from api.database import db, ma, Report, ReportSchema, AdminUser
+        from api.database import db, ma, Report, ReportSchema, AdminUser, AnalysisCache
         print("Database models imported from api package")
     except ImportError as e:
         print(f"CRITICAL: Could not import database models: {e}")
@@ -75,13 +143,23 @@ except ImportError:
 db.init_app(app)
 ma.init_app(app)
 
+if DATABASE_URL.startswith('sqlite'):
+    with app.app_context():
+        event.listen(db.engine, "connect", _sqlite_pragmas)
+
 # --- UPLOAD CONFIG ---
-UPLOAD_FOLDER = '/tmp/uploads'
-ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
+# /tmp is RAM-backed on Render; point UPLOAD_FOLDER at a persistent disk to keep uploads off tmpfs
+UPLOAD_FOLDER = os.environ.get('UPLOAD_FOLDER', '/tmp/uploads')
+ALLOWED_EXTENSIONS = frozenset({'png', 'jpg', 'jpeg', 'gif'})
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
+# Behind nginx, hand upload downloads to an internal location so nginx streams them:
+#   location /internal_uploads/ { internal; alias /tmp/uploads/; sendfile on; tcp_nopush on; }
+USE_XACCEL = os.environ.get('USE_XACCEL', '').lower() in ('1', 'true', 'yes')
+XACCEL_PREFIX = os.environ.get('XACCEL_PREFIX', '/internal_uploads/').rstrip('/') + '/'
+
 # Create tables on startup
 with app.app_context():
     try:
@@ -99,8 +177,96 @@ try:
 except ImportError as e:
     print(f"Budget API skipped: {e}")
 
+# --- OPTIONAL LIBJPEG-TURBO ENCODER ---
+# PyTurboJPEG needs the system libturbojpeg; without it uploads are encoded by Pillow
+try:
+    from turbojpeg import TurboJPEG, TJPF_RGB
+    _turbo_jpeg = TurboJPEG()
+    print("TurboJPEG encoder enabled")
+except (ImportError, OSError, RuntimeError) as e:
+    _turbo_jpeg = None
+    print(f"TurboJPEG skipped: {e}")
+
 # --- GLOBAL PIPELINE VAR ---
 pipeline = None 
+_PIPELINE_LOCK = threading.Lock()
+
+def _load_pipeline_once():
+    """Load the AI pipeline once per process. Safe to call from any thread."""
+    global pipeline
+    if pipeline is None:
+        with _PIPELINE_LOCK:
+            if pipeline is None:
+                # Lazy import to prevent startup timeout
+                try:
+                    from api.damagepipeline import initialize_pipeline
+                except ImportError:
+                    try:
+                        from damagepipeline import initialize_pipeline
+                    except ImportError:
+                        print("Could not find pipeline module")
+                        return None
+
+                print("[Pipeline] Loading AI Model...")
+                possible_paths = [
+                    os.path.join("/tmp", "best.pt"),
+                    "best.pt",
+                    os.path.join(os.getcwd(), "best.pt")
+                ]
+                TEMP_MODEL_PATH = next((p for p in possible_paths if os.path.exists(p)), os.path.join("/tmp", "best.pt"))
+                
+                ROAD_CLASSIFIER_PATH = "tomunizua/road-classification_filter"
+                pipeline = initialize_pipeline(ROAD_CLASSIFIER_PATH, TEMP_MODEL_PATH)
+                # Model objects live for the whole process; keep them out of GC scans
+                gc.freeze()
+    return pipeline
+
+# --- RESPONSE CACHES ---
+# Citizens poll /api/track while the AI runs and probes hit /api/health constantly,
+# so both are served from short-lived caches instead of querying on every hit.
+_TRACK_CACHE = TTLCache(maxsize=4096, ttl=5)
+# Completed/rejected reports rarely change again, so they stay cached longer. Other gunicorn
+# workers don't see local invalidations, which bounds how stale this can get to the TTL.
+_TRACK_DONE_CACHE = TTLCache(maxsize=4096, ttl=60)
+_TRACK_TERMINAL = frozenset({'completed', 'rejected'})
+_TRACK_LOCK = threading.Lock()
+_HEALTH_CACHE = TTLCache(maxsize=1, ttl=10)
+_HEALTH_LOCK = threading.Lock()
+# Admin dashboards poll analytics; keep the encoded body for a few seconds
+_ANALYTICS_CACHE = TTLCache(maxsize=1, ttl=10)
+_ANALYTICS_LOCK = threading.Lock()
+
+def invalidate_track_cache(tracking_number):
+    with _TRACK_LOCK:
+        _TRACK_CACHE.pop(tracking_number, None)
+        _TRACK_DONE_CACHE.pop(tracking_number, None)
+
+def clear_track_cache():
+    with _TRACK_LOCK:
+        _TRACK_CACHE.clear()
+        _TRACK_DONE_CACHE.clear()
+
+def invalidate_analytics_cache():
+    with _ANALYTICS_LOCK:
+        _ANALYTICS_CACHE.clear()
+
+def count_reports(exact=False):
+    # COUNT(*) scans the whole table on Postgres; the planner's estimate is a catalog lookup
+    if _IS_PG and not exact:
+        estimate = db.session.execute(text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'reports'::regclass")).scalar()
+        # reltuples is -1 until the table has been vacuumed/analyzed once
+        if estimate is not None and estimate >= 0:
+            return int(estimate)
+    return Report.query.count()
+
+def get_cached_report_count():
+    with _HEALTH_LOCK:
+        total = _HEALTH_CACHE.get('total_reports')
+    if total is None:
+        total = count_reports()
+        with _HEALTH_LOCK:
+            _HEALTH_CACHE['total_reports'] = total
+    return total
 
 # --- HELPER FUNCTIONS ---
 def get_severity_level(severity_score):
@@ -110,62 +276,166 @@ def get_severity_level(severity_score):
     if severity_score > 0: return 'low'        
     return 'none'
 
+def get_severity_levels(scores):
+    # Array form of get_severity_level for a whole batch of scores
+    return np.select([scores >= 70, scores >= 30, scores > 0], ['high', 'medium', 'low'], default='none')
+
+_URGENCY_MAP = MappingProxyType({'high': 'immediate', 'medium': 'scheduled', 'low': 'routine'})
+
 def get_repair_urgency(severity_level):
-    if severity_level == 'high': return 'immediate'
-    if severity_level == 'medium': return 'scheduled'
-    if severity_level == 'low': return 'routine'
-    return 'monitoring'
+    return _URGENCY_MAP.get(severity_level, 'monitoring')
+
+# Realistic Base Costs (₦)
+_BASE_COSTS = MappingProxyType({
+    'pothole': 45000,
+    'longitudinal_crack': 25000,
+    'lateral_crack': 30000,
+    'alligator_crack': 85000,
+    'mixed': 60000,
+    'none': 0
+})
 
 def estimate_repair_cost(damage_type, severity_score, damage_count):
     if severity_score is None: severity_score = 0
-    
-    # Realistic Base Costs (₦)
-    base_costs = {
-        'pothole': 45000,
-        'longitudinal_crack': 25000,
-        'lateral_crack': 30000,
-        'alligator_crack': 85000,
-        'mixed': 60000,
-        'none': 0
-    }
-    
-    base_cost = base_costs.get(damage_type, 35000)
-    severity_multiplier = 1 + (severity_score / 100.0) 
-    count_multiplier = max(1, 1 + (damage_count - 1) * 0.5)
-    
-    total_cost = int(base_cost * severity_multiplier * count_multiplier)
+    base_cost = _BASE_COSTS.get(damage_type, 35000)
+    # base * (1 + severity/100) * max(1, 1 + (count-1)/2), in integer math
+    total_cost = base_cost * (100 + severity_score) * max(2, damage_count + 1) // 200
     return ((total_cost + 250) // 500) * 500
 
+def find_report(report_id):
+    # Numeric IDs hit the primary key (identity map first); anything else is a tracking number
+    report_id = str(report_id).strip()
+    if report_id.isdigit(): return db.session.get(Report, int(report_id))
+    return Report.query.filter_by(tracking_number=report_id).first()
+
 def generate_tracking_number():
-    return f"RW{datetime.now().strftime('%Y%m%d')}{str(uuid.uuid4())[:8].upper()}"
+    # Same RW + date + 8 hex format as before; 4 random bytes straight from the OS CSPRNG
+    return f"RW{time.strftime('%Y%m%d')}{secrets.token_hex(4).upper()}"
+
+def drop_page_cache(filepath):
+    """Hint the kernel to evict a file we won't read again (Linux only)."""
+    if not hasattr(os, 'posix_fadvise'): return
+    try:
+        fd = os.open(filepath, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+    except OSError:
+        pass
+
+def write_upload(filepath, data):
+    with open(filepath, 'wb', buffering=0) as f:
+        view = memoryview(data)
+        while view:
+            view = view[f.write(view):]
+
+# Upload limits: the base64 length is checked before decoding and the pixel count before any
+# pixel decode (PIL only parses the header here), so oversized or "bomb" images are refused cheaply
+MAX_PHOTO_BYTES = 12 * 1024 * 1024
+MAX_IMAGE_PIXELS = 25_000_000
+# Longest side stored; larger photos are downscaled once here instead of by every consumer
+MAX_IMAGE_SIDE = 1280
+
+class UploadTooLarge(Exception): pass
 
 def save_base64_image(base64_string, filename):
     try:
-        if ',' in base64_string:
-            base64_string = base64_string.split(',')[1]
-        image_data = base64.b64decode(base64_string)
-        image = Image.open(io.BytesIO(image_data))
-        if image.mode in ('RGBA', 'P'):
-            image = image.convert('RGB')
+        # Strip a data-URL prefix with one slice (split() copied both halves into a list), then
+        # decode with a2b_base64, which reads an ASCII str in place; b64decode re-encodes it first
+        comma = base64_string.find(',')
+        if comma >= 0:
+            base64_string = base64_string[comma + 1:]
+        if len(base64_string) > MAX_PHOTO_BYTES * 4 // 3 + 4: raise UploadTooLarge('Photo is too large')
+        image_data = binascii.a2b_base64(base64_string)
+    except UploadTooLarge:
+        raise
+    except Exception:
+        app.logger.exception("Error saving image %s", filename)
+        return None
+    with io.BytesIO(image_data) as buf:
+        return save_image_file(buf, filename)
+
+EXIF_ORIENTATION = 0x0112
+
+def strip_jpeg_metadata(data):
+    """Drops APP1 (EXIF/XMP: GPS, device, capture time) and APP13 (IPTC) segments from a JPEG.
+    Only the header segments are walked; the compressed image data is copied untouched."""
+    parts = [data[:2]]  # SOI
+    pos = 2
+    while pos + 4 <= len(data) and data[pos] == 0xFF:
+        marker = data[pos + 1]
+        if marker == 0xFF:
+            pos += 1  # fill byte
+            continue
+        if marker in (0xDA, 0xD9): break  # SOS (entropy-coded data follows) or EOI
+        end = pos + 2 + int.from_bytes(data[pos + 2:pos + 4], 'big')
+        if marker not in (0xE1, 0xED): parts.append(data[pos:end])
+        pos = end
+    parts.append(data[pos:])
+    return b''.join(parts)
+
+def save_image_file(src, filename):
+    """Stores an uploaded photo from a seekable binary file (multipart upload stream or BytesIO)."""
+    try:
+        src.seek(0, os.SEEK_END)
+        if src.tell() > MAX_PHOTO_BYTES: raise UploadTooLarge('Photo is too large')
+        src.seek(0)
         filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        image.save(filepath, 'JPEG', quality=85)
+        try:
+            image = Image.open(src)
+        except Image.DecompressionBombError:
+            # PIL refuses anything past 2x its own bomb limit before our pixel check can see it
+            raise UploadTooLarge('Photo is too large')
+        width, height = image.size
+        if width * height > MAX_IMAGE_PIXELS: raise UploadTooLarge(f'Photo is too large ({width}x{height})')
+        if max(width, height) > MAX_IMAGE_SIDE:
+            # Nothing downstream needs full camera resolution. draft() lets libjpeg decode at
+            # 1/2, 1/4 or 1/8 scale, and EXIF rotation is applied since re-encoding drops the tag
+            image.draft(image.mode, (MAX_IMAGE_SIDE, MAX_IMAGE_SIDE))
+            image = ImageOps.exif_transpose(image)
+            image.thumbnail((MAX_IMAGE_SIDE, MAX_IMAGE_SIDE), Image.Resampling.LANCZOS)
+        elif image.format == 'JPEG' and image.mode in ('RGB', 'L') and image.getexif().get(EXIF_ORIENTATION, 1) == 1:
+            # Phone uploads are usually JPEG already; store the compressed data as-is instead of
+            # re-encoding, minus the metadata (uploads are public). CMYK and rotated JPEGs still go
+            # through the re-encode below so they are stored as upright RGB
+            src.seek(0)
+            write_upload(filepath, strip_jpeg_metadata(src.read()))
+            return filepath
+        else:
+            image = ImageOps.exif_transpose(image)
+        if image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+        if _turbo_jpeg is not None and image.mode == 'RGB':
+            write_upload(filepath, _turbo_jpeg.encode(np.asarray(image), quality=85, pixel_format=TJPF_RGB))
+            return filepath
+        # Encode in memory so the file is written in one call rather than encoder-sized chunks
+        with io.BytesIO() as out:
+            image.save(out, 'JPEG', quality=85)
+            write_upload(filepath, out.getbuffer())
         return filepath
-    except Exception as e:
-        print(f"Error saving image: {e}")
+    except UploadTooLarge:
+        raise
+    except Exception:
+        app.logger.exception("Error saving image %s", filename)
         return None
 
 # --- OPENCV DIMENSION ESTIMATION (From model (2).py) ---
-def estimate_dimensions_opencv(image_path, user_size_category='Not Specified'):
+def estimate_dimensions_opencv(image_path, user_size_category='Not Specified', image_data=None):
     """
     Estimates physical dimensions (L, B) in cm using contour analysis and PCA.
     Uses user_size_category to calibrate pixel_per_cm scale.
+    Pass image_data (the file's bytes) to decode from memory instead of re-reading the file.
     """
     try:
-        img = cv2.imread(image_path)
+        # Decode straight to grayscale: no 3-channel buffer and no separate BGR->gray pass
+        if image_data is not None:
+            img = cv2.imdecode(np.frombuffer(image_data, dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+        else:
+            img = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
         if img is None: return 0, 0
         
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        blur = cv2.GaussianBlur(gray, (5, 5), 0)
+        blur = cv2.GaussianBlur(img, (5, 5), 0)
         
         # Otsu's thresholding to find dark spots (potholes)
         _, thresh = cv2.threshold(blur, 0, 255, cv2.THRESH_OTSU)
@@ -216,8 +486,8 @@ def estimate_dimensions_opencv(image_path, user_size_category='Not Specified'):
         
         return round(length_cm, 1), round(breadth_cm, 1)
 
-    except Exception as e:
-        print(f"OpenCV Estimation Error: {e}")
+    except Exception:
+        app.logger.exception("OpenCV dimension estimation failed")
         return 0, 0
 
 def classify_severity_from_dimensions(length_cm, breadth_cm):
@@ -233,37 +503,47 @@ def classify_severity_from_dimensions(length_cm, breadth_cm):
         return 85, "high" # Score 85
 
 # --- BACKGROUND AI WORKER ---
-def process_ai_background(report_id, image_path):
+# Bounded pool so a burst of submissions queues up instead of spawning a thread each.
+# AI_WORKERS (read with the database config above) = 1 serializes analysis completely.
+inference_executor = ThreadPoolExecutor(max_workers=AI_WORKERS, thread_name_prefix='ai-worker')
+
+# Stored analyses are only useful for re-submitted photos, so they expire instead of growing forever
+ANALYSIS_CACHE_TTL = timedelta(days=int(os.environ.get('ANALYSIS_CACHE_TTL_DAYS', 30)))
+_last_cache_prune = 0.0
+
+def prune_analysis_cache():
+    """Deletes expired analysis_cache rows; runs at most once an hour per process."""
+    global _last_cache_prune
+    if time.time() - _last_cache_prune < 3600: return
+    _last_cache_prune = time.time()
+    db.session.execute(delete(AnalysisCache).where(AnalysisCache.created_at < datetime.utcnow() - ANALYSIS_CACHE_TTL))
+    db.session.commit()
+
+def process_ai_background(report_id, image_path, use_cache=True):
     with app.app_context():
-        print(f"[Background] Processing Report {report_id}...")
+        app.logger.debug("[Background] Processing Report %s...", report_id)
         try:
-            # Lazy import to prevent startup timeout
-            print("[Background] Importing AI modules...")
-            try:
-                from api.damagepipeline import initialize_pipeline
-            except ImportError:
-                try:
-                    from damagepipeline import initialize_pipeline
-                except ImportError:
-                    print("Could not find pipeline module")
-                    return
-            
-            global pipeline
-            if pipeline is None:
-                print("[Background] Loading AI Model...")
-                possible_paths = [
-                    os.path.join("/tmp", "best.pt"),
-                    "best.pt",
-                    os.path.join(os.getcwd(), "best.pt")
-                ]
-                TEMP_MODEL_PATH = next((p for p in possible_paths if os.path.exists(p)), os.path.join("/tmp", "best.pt"))
-                
-                ROAD_CLASSIFIER_PATH = "tomunizua/road-classification_filter"
-                pipeline = initialize_pipeline(ROAD_CLASSIFIER_PATH, TEMP_MODEL_PATH)
-
-            if pipeline:
-                # 1. Run Roboflow Detection (Finds what it is)
-                result = pipeline.analyze_image(image_path)
+            active_pipeline = _load_pipeline_once()
+
+            if active_pipeline:
+                # Read the upload once; detection and dimension estimation share the bytes
+                with open(image_path, 'rb') as f:
+                    image_data = f.read()
+
+                # 1. Run Roboflow Detection (Finds what it is), unless this exact photo was analysed
+                # before by the same model; switching MODEL_ID starts from a fresh set of keys
+                hasher = hashlib.blake2b(active_pipeline.model_id.encode(), digest_size=16)
+                hasher.update(b'\0')
+                hasher.update(image_data)
+                image_hash = hasher.hexdigest()
+                # use_cache=False (admin reprocess) always asks the provider and overwrites the stored result
+                cached = db.session.get(AnalysisCache, image_hash) if use_cache else None
+                if cached and cached.created_at < datetime.utcnow() - ANALYSIS_CACHE_TTL: cached = None
+                if cached:
+                    result = cached.result
+                    app.logger.debug("[Background] Report %s reuses analysis %s", report_id, image_hash)
+                else:
+                    result = active_pipeline.analyze_image(image_path, image_data)
                 
                 report = Report.query.get(report_id)
                 if report:
@@ -272,15 +552,15 @@ def process_ai_background(report_id, image_path):
                         
                         # 2. Run OpenCV Dimension Estimation (Finds how big it is)
                         # Uses user's "Small/Medium/Large" input to calibrate
-                        length_cm, breadth_cm = estimate_dimensions_opencv(image_path, report.user_reported_size)
+                        length_cm, breadth_cm = estimate_dimensions_opencv(image_path, report.user_reported_size, image_data)
                         
                         # 3. Classify Severity based on Real Dimensions
                         if length_cm > 0:
                             severity_score, severity_level = classify_severity_from_dimensions(length_cm, breadth_cm)
-                            print(f"📏 Dimensions: {length_cm}cm x {breadth_cm}cm -> {severity_level}")
+                            app.logger.debug("📏 Dimensions: %scm x %scm -> %s", length_cm, breadth_cm, severity_level)
                         else:
                             # Fallback if OpenCV fails (too dark/blurry)
-                            print("⚠️ OpenCV failed, using fallback severity")
+                            app.logger.warning("⚠️ OpenCV failed, using fallback severity")
                             severity_score = 50
                             severity_level = "medium"
 
@@ -310,33 +590,74 @@ def process_ai_background(report_id, image_path):
                         report.status = 'completed'
 
                     db.session.commit()
-                    print(f"✅ [Background] Report {report_id} updated.")
+                    invalidate_track_cache(report.tracking_number)
+
+                    # Provider errors also come back as 'completed' (with a message); never cache those
+                    if not cached and result['status'] in ('completed', 'no_damage') and 'message' not in result:
+                        try:
+                            # merge() replaces a stale or force-reprocessed row instead of failing on the key
+                            db.session.merge(AnalysisCache(image_hash=image_hash, result=result, created_at=datetime.utcnow()))
+                            db.session.commit()
+                        except IntegrityError:
+                            # Another worker cached the same photo first
+                            db.session.rollback()
+                        prune_analysis_cache()
+                    app.logger.info("✅ [Background] Report %s updated.", report_id)
             
+            # The image is kept for the admin dashboard but this process is done reading it
+            drop_page_cache(image_path)
             gc.collect()
             
-        except Exception as e:
-            print(f"Background Error: {e}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            # Level-gated: the traceback is only formatted when ERROR records are emitted
+            app.logger.exception("Background analysis failed for report %s", report_id)
 
 # --- ROUTES ---
 
 @app.route('/api/submit-report', methods=['POST'])
 def submit_report():
+    # Deprecated: base64-in-JSON inflates the photo by a third; new clients use /api/submit-report-multipart
     try:
         data = request.get_json()
-        if not data: return jsonify({'error': 'No data'}), 400
-        
+    except RequestEntityTooLarge:
+        # Body over MAX_CONTENT_LENGTH; raised by get_json() before any decoding
+        return jsonify({'error': 'Upload is too large'}), 413
+    if not data or not isinstance(data, dict): return jsonify({'error': 'No data'}), 400
+    if data.get('gps_coordinates') and not isinstance(data['gps_coordinates'], dict): return jsonify({'error': 'gps_coordinates must be a JSON object'}), 400
+    return create_report(data, data.get('photo'), save_base64_image)
+
+@app.route('/api/submit-report-multipart', methods=['POST'])
+def submit_report_multipart():
+    # Same fields as /api/submit-report, sent as form fields with the photo as a raw file part.
+    # Werkzeug spools the file to disk as it arrives, so there is no base64 text to decode
+    try:
+        data = request.form.to_dict()
+        photo = request.files.get('photo')
+    except RequestEntityTooLarge:
+        return jsonify({'error': 'Upload is too large'}), 413
+    if data.get('gps_coordinates'):
+        try:
+            data['gps_coordinates'] = orjson.loads(data['gps_coordinates'])
+        except orjson.JSONDecodeError:
+            data['gps_coordinates'] = None
+        if not isinstance(data['gps_coordinates'], dict): return jsonify({'error': 'gps_coordinates must be a JSON object'}), 400
+    return create_report(data, photo.stream if photo else None, save_image_file)
+
+def create_report(data, photo, save_photo):
+    try:
         tracking_number = generate_tracking_number()
         image_filename = None
         image_path = None
         
-        if data.get('photo'):
+        if photo:
             filename = f"{tracking_number}_{secure_filename('report.jpg')}"
-            image_path = save_base64_image(data['photo'], filename)
-            image_filename = filename
+            try:
+                image_path = save_photo(photo, filename)
+            except UploadTooLarge as e:
+                return jsonify({'error': str(e)}), 413
+            if image_path: image_filename = filename
 
-        gps_data = data.get('gps_coordinates', {})
+        gps_data = data.get('gps_coordinates') or {}
         reported_size = data.get('size', 'Not Specified')
 
         new_report = Report(
@@ -358,19 +679,19 @@ def submit_report():
         db.session.add(new_report)
         db.session.commit()
         
-        if image_filename and image_path:
-            thread = threading.Thread(target=process_ai_background, args=(new_report.id, image_path))
-            thread.start()
+        analysis_queued = bool(image_filename and image_path)
+        if analysis_queued:
+            inference_executor.submit(process_ai_background, new_report.id, image_path)
         
         return jsonify({
             'success': True,
             'tracking_number': tracking_number,
             'message': 'Report submitted! AI analysis in progress.',
             'report_id': new_report.id
-        })
+        }), 202 if analysis_queued else 200
         
     except Exception as e:
-        print(f"Error submitting report: {e}")
+        app.logger.exception("Error submitting report")
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/admin/login', methods=['POST'])
@@ -386,46 +707,139 @@ def admin_login():
         user = AdminUser.query.filter_by(username=username).first()
         if user is None or not user.check_password(password):
             return jsonify({"error": "Invalid credentials"}), 401
+        if user.password_needs_rehash():
+            # Upgrade legacy werkzeug hashes to argon2 on the next successful login
+            user.set_password(password)
+            db.session.commit()
         
         access_token = create_access_token(identity=user.username)
         return jsonify(token=access_token)
-    except Exception as e:
-        print(f"Login Error: {e}")
+    except Exception:
+        app.logger.exception("Error during admin login")
         return jsonify({"error": "Server error"}), 500
 
+# Columns the admin list needs; selecting them directly skips building ORM objects
+_ADMIN_LIST_COLUMNS = (
+    Report.id, Report.tracking_number, Report.location, Report.description,
+    Report.damage_type, Report.severity_score, Report.severity_level, Report.repair_urgency,
+    Report.user_reported_size, Report.status, Report.estimated_cost, Report.image_filename,
+    Report.created_at, Report.lga, Report.confidence
+)
+
 @app.route('/api/admin/reports', methods=['GET'])
 @jwt_required()
 def get_admin_reports():
     try:
-        reports = Report.query.order_by(Report.created_at.desc()).all()
-        reports_data = []
-        for r in reports:
-            photo_url = None
-            if r.image_filename:
-                photo_url = f"{BASE_URL}/api/uploads/{secure_filename(r.image_filename)}"
-            
-            reports_data.append({
-                'id': r.id,
-                'tracking_number': r.tracking_number,
-                'location': r.location,
-                'description': r.description,
-                'damage_type': r.damage_type or 'processing',
-                'severity_score': (r.severity_score or 0) / 100.0,
-                'severity_level': r.severity_level,
-                'repair_urgency': r.repair_urgency,
-                'user_reported_size': r.user_reported_size,
-                'status': r.status,
-                'estimated_cost': r.estimated_cost or 0,
-                'photo_url': photo_url,
-                'created_at': r.created_at.isoformat(),
-                'lga': r.lga,
-                'confidence': r.confidence or 0.0
-            })
-        return jsonify({'reports': reports_data})
+        stmt = select(*_ADMIN_LIST_COLUMNS).order_by(Report.created_at.desc(), Report.id.desc())
+
+        # Optional keyset pagination: ?limit=50&cursor=<next_cursor from the previous page>.
+        # The cursor is "<created_at iso>|<id>" so rows sharing a timestamp across a page break aren't skipped
+        limit = request.args.get('limit', type=int)
+        cursor = request.args.get('cursor')
+        if cursor:
+            try:
+                cursor_created, _, cursor_id = cursor.rpartition('|')
+                stmt = stmt.where(tuple_(Report.created_at, Report.id) < (datetime.fromisoformat(cursor_created), int(cursor_id)))
+            except ValueError:
+                return jsonify({'error': 'Invalid cursor'}), 400
+        if limit:
+            limit = max(1, min(limit, 500))
+            stmt = stmt.limit(limit)
+
+        # Executing here (not inside the generator) keeps DB errors on the 500 path below
+        result = db.session.execute(stmt.execution_options(yield_per=200)).mappings()
+
+        def _stream():
+            # Rows go out in batches while the cursor is still open, instead of
+            # building the full list and then a second full copy as JSON
+            yield b'{"reports":['
+            sep = b''
+            sent = 0
+            last_row = None
+            for rows in result.partitions():
+                # Score scaling and missing severity levels are computed per batch, not per row
+                scores = np.fromiter((r['severity_score'] or 0 for r in rows), dtype=np.int32, count=len(rows))
+                levels = get_severity_levels(scores).tolist()
+                scaled = (scores / 100.0).tolist()
+
+                batch = []
+                for r, level, score in zip(rows, levels, scaled):
+                    # Stored filenames were sanitized when written, so no secure_filename here
+                    photo_url = _UPLOAD_PREFIX + r['image_filename'] if r['image_filename'] else None
+                    
+                    batch.append(orjson.dumps({
+                        'id': r['id'],
+                        'tracking_number': r['tracking_number'],
+                        'location': r['location'],
+                        'description': r['description'],
+                        'damage_type': r['damage_type'] or 'processing',
+                        'severity_score': score,
+                        'severity_level': r['severity_level'] or level,
+                        'repair_urgency': r['repair_urgency'],
+                        'user_reported_size': r['user_reported_size'],
+                        'status': r['status'],
+                        'estimated_cost': r['estimated_cost'] or 0,
+                        'photo_url': photo_url,
+                        'created_at': r['created_at'].isoformat(),
+                        'lga': r['lga'],
+                        'confidence': r['confidence'] or 0.0
+                    }))
+                yield sep + b','.join(batch)
+                sep = b','
+                sent += len(rows)
+                last_row = rows[-1]
+
+            next_cursor = f"{last_row['created_at'].isoformat()}|{last_row['id']}" if limit and sent == limit else None
+            yield b'],"next_cursor":' + orjson.dumps(next_cursor) + b'}'
+
+        return Response(stream_with_context(_stream()), mimetype='application/json')
     except Exception as e:
-        print(f"Admin Report List Error: {e}")
+        app.logger.exception("Error listing admin reports")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/admin/analytics', methods=['GET'])
+@jwt_required()
+def get_admin_analytics():
+    try:
+        # Held while computing so concurrent pollers share one query burst
+        with _ANALYTICS_LOCK:
+            body = _ANALYTICS_CACHE.get('body')
+            if body is None:
+                body = orjson.dumps(compute_admin_analytics())
+                _ANALYTICS_CACHE['body'] = body
+        return Response(body, mimetype='application/json')
+    except Exception as e:
+        app.logger.exception("Error computing admin analytics")
+        return jsonify({'error': str(e)}), 500
+
+def compute_admin_analytics():
+    # One grouped scan: every counter is a sum over the (status, damage_type, severity band)
+    # groups, of which there are only a few dozen, so the rest is done in Python
+    # Same bands as get_severity_levels: unscored rows (pending, processing, no damage) are 'none', not 'low'
+    band = case((Report.severity_score >= 70, 'high'), (Report.severity_score >= 30, 'medium'),
+                (Report.severity_score > 0, 'low'), else_='none')
+    groups = db.session.query(Report.status, Report.damage_type, band, func.count()) \
+        .group_by(Report.status, Report.damage_type, band).all()
+
+    status_counts, damage_counts = Counter(), Counter()
+    severity_counts = {'high': 0, 'medium': 0, 'low': 0, 'none': 0}
+    for status, damage_type, severity, n in groups:
+        status_counts[status] += n
+        damage_counts[damage_type] += n
+        severity_counts[severity] += n
+
+    total = sum(status_counts.values())
+    completed = status_counts.get('completed', 0)
+    return {
+        'total_reports': total,
+        'completed_reports': completed,
+        'completion_rate': round(completed / total * 100, 1) if total else 0,
+        'high_severity_reports': severity_counts['high'],
+        'severity_distribution': severity_counts,
+        'status_distribution': dict(status_counts),
+        'damage_type_distribution': dict(damage_counts)
+    }
+
 @app.route('/api/admin/reprocess/<int:report_id>', methods=['POST'])
 @jwt_required()
 def force_reprocess(report_id):
@@ -435,13 +849,61 @@ def force_reprocess(report_id):
         if not report.image_filename: return jsonify({'error': 'No image'}), 400
 
         image_path = os.path.join(app.config['UPLOAD_FOLDER'], report.image_filename)
-        thread = threading.Thread(target=process_ai_background, args=(report.id, image_path))
-        thread.start()
+        inference_executor.submit(process_ai_background, report.id, image_path, use_cache=False)
         
         return jsonify({'message': f'Reprocessing triggered for {report.tracking_number}'})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+VALID_STATUSES = frozenset({'submitted', 'under_review', 'scheduled', 'in_progress', 'completed', 'rejected'})
+
+@app.route('/api/admin/update-status', methods=['POST'])
+@jwt_required()
+def update_report_status():
+    try:
+        data = request.get_json(silent=True) or {}
+        report_id = data.get('report_id')
+        report_ids = data.get('report_ids')
+        new_status = data.get('status')
+        if (report_id is None and not report_ids) or not new_status: return jsonify({'error': 'report_id (or report_ids) and status are required'}), 400
+        if new_status not in VALID_STATUSES: return jsonify({'error': f'Invalid status: {new_status}'}), 400
+
+        if report_ids:
+            if not isinstance(report_ids, list): return jsonify({'error': 'report_ids must be a list'}), 400
+            requested, updated = bulk_update_status(report_ids, new_status)
+            return jsonify({'message': f'{updated} report(s) updated to {new_status}', 'status': new_status, 'updated': updated, 'not_found': requested - updated})
+
+        report = find_report(report_id)
+        if not report: return jsonify({'error': 'Report not found'}), 404
+
+        report.status = new_status
+        db.session.commit()
+        invalidate_track_cache(report.tracking_number)
+        invalidate_analytics_cache()
+
+        return jsonify({'message': f'Status updated to {new_status}', 'tracking_number': report.tracking_number, 'status': new_status})
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+def bulk_update_status(report_ids, new_status, chunk_size=500):
+    # Set-based UPDATEs in one transaction instead of one request + commit per report.
+    # IDs and tracking numbers get separate IN lists (see find_report); chunks stay under SQLite's variable limit.
+    ids = {str(r).strip() for r in report_ids}
+    numeric = [int(r) for r in ids if r.isdigit()]
+    tracking = [r for r in ids if not r.isdigit()]
+
+    updated = 0
+    for column, values in ((Report.id, numeric), (Report.tracking_number, tracking)):
+        for i in range(0, len(values), chunk_size):
+            stmt = update(Report).where(column.in_(values[i:i + chunk_size])).values(status=new_status)
+            updated += db.session.execute(stmt, execution_options={'synchronize_session': False}).rowcount
+    db.session.commit()
+
+    clear_track_cache()
+    invalidate_analytics_cache()
+    return len(ids), updated
+
 @app.route('/api/create-admin', methods=['GET'])
 def create_initial_admin():
     try:
@@ -458,37 +920,65 @@ def create_initial_admin():
 @app.route('/api/track/<tracking_number>', methods=['GET'])
 def track_report(tracking_number):
     try:
-        report = Report.query.filter_by(tracking_number=tracking_number).first()
-        if not report: return jsonify({'error': 'Not found'}), 404
-        return jsonify({
-            'tracking_number': report.tracking_number,
-            'status': report.status,
-            'damage_type': report.damage_type,
-            'severity_level': report.severity_level,
-            'estimated_cost': report.estimated_cost,
-            'location': report.location,
-            'created_at': report.created_at.isoformat()
-        })
+        with _TRACK_LOCK:
+            payload = _TRACK_DONE_CACHE.get(tracking_number) or _TRACK_CACHE.get(tracking_number)
+        if payload is None:
+            report = Report.query.filter_by(tracking_number=tracking_number).first()
+            if not report: return jsonify({'error': 'Not found'}), 404
+            payload = {
+                'tracking_number': report.tracking_number,
+                'status': report.status,
+                'damage_type': report.damage_type,
+                'severity_level': report.severity_level,
+                'estimated_cost': report.estimated_cost,
+                'location': report.location,
+                'created_at': report.created_at
+            }
+            cache = _TRACK_DONE_CACHE if report.status in _TRACK_TERMINAL else _TRACK_CACHE
+            with _TRACK_LOCK:
+                cache[tracking_number] = payload
+        return jsonify(payload)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+# Uploads are written once under a unique tracking-number name, so browsers can keep them
+UPLOAD_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
 @app.route('/api/uploads/<filename>', methods=['GET'])
 def serve_upload(filename):
     try:
-        return send_from_directory(app.config['UPLOAD_FOLDER'], filename)
+        if USE_XACCEL:
+            resp = Response()
+            resp.headers['X-Accel-Redirect'] = XACCEL_PREFIX + secure_filename(filename)
+            resp.headers['Content-Type'] = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        else:
+            # conditional=True answers If-None-Match / If-Modified-Since with a 304
+            resp = send_from_directory(app.config['UPLOAD_FOLDER'], filename, conditional=True)
+        resp.headers['Cache-Control'] = UPLOAD_CACHE_CONTROL
+        return resp
     except Exception as e:
         return jsonify({'error': 'File not found'}), 404
 
+# Static body, serialized once at import
+_TEST_BODY = orjson.dumps({'status': 'ok', 'message': 'RoadWatch API is running'})
+
+@app.route('/api/test', methods=['GET'])
+def test_endpoint():
+    return Response(_TEST_BODY, mimetype='application/json')
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     try:
-        total = Report.query.count()
+        if request.args.get('exact') == '1':
+            total = count_reports(exact=True)
+        else:
+            total = get_cached_report_count()
         return jsonify({'status': 'healthy', 'total_reports': total, 'pipeline_active': pipeline is not None})
     except Exception as e:
         return jsonify({'status': 'unhealthy', 'error': str(e)}), 500
 
 if __name__ == '__main__':
-    with app.app_context():
-        db.create_all()
+    # Local development only; production runs under gunicorn (see gunicorn.conf.py).
+    # Tables were already created at import.
     port = int(os.environ.get('PORT', 5000))
     app.run(host='0.0.0.0', port=port)
\ No newline at end of file
@@ -0,0 +1,33 @@
+"""
+JWT manager that remembers recently verified tokens.
+The admin dashboard polls with the same token, so re-verifying it on every request is wasted work.
+"""
+import hashlib
+import threading
+import time
+from cachetools import TTLCache
+from flask_jwt_extended import JWTManager
+
+
+class CachingJWTManager(JWTManager):
+    def __init__(self, app=None, maxsize=10000, ttl=30):
+        # Keyed by a hash of the token so raw tokens are never held in memory
+        self._claims_cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._claims_lock = threading.Lock()
+        super().__init__(app)
+
+    def _decode_jwt_from_config(self, encoded_token, csrf_value=None, allow_expired=False):
+        if csrf_value is not None or allow_expired:
+            return super()._decode_jwt_from_config(encoded_token, csrf_value, allow_expired)
+
+        key = hashlib.sha256(encoded_token.encode()).digest()
+        with self._claims_lock:
+            entry = self._claims_cache.get(key)
+        # Entries live at most `ttl` seconds and never past the token's own expiry
+        if entry is not None and time.time() < entry[1]:
+            return entry[0]
+
+        claims = super()._decode_jwt_from_config(encoded_token, csrf_value, allow_expired)
+        with self._claims_lock:
+            self._claims_cache[key] = (claims, claims.get('exp', float('inf')))
+        return claims
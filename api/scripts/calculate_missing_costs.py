@@ -10,6 +10,7 @@ import sys
 # Add parent directory to path to import backend modules
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
+from sqlalchemy import or_, select, text
 from database import db, Report
 from integrated_backend import app, estimate_repair_cost
 
@@ -17,29 +18,31 @@ def calculate_missing_costs():
     """Calculate estimated costs for reports that are missing them"""
     with app.app_context():
         try:
-            # Get all reports
-            reports = Report.query.all()
-            updated_count = 0
+            # Only the reports missing a cost, and only the columns the estimate needs
+            rows = db.session.execute(
+                select(Report.id, Report.tracking_number, Report.damage_type, Report.severity_score)
+                .where(or_(Report.estimated_cost == 0, Report.estimated_cost.is_(None)))
+            ).all()
             
-            print(f"📊 Checking {len(reports)} reports for missing estimated costs...")
+            print(f"📊 Found {len(rows)} reports with missing estimated costs...")
             
-            for report in reports:
-                # If estimated_cost is 0 or None, recalculate it
-                if not report.estimated_cost:
-                    # Calculate cost based on existing data
-                    cost = estimate_repair_cost(
-                        report.damage_type or 'unknown',
-                        report.severity_score or 0,
-                        1  # Assume 1 damage for existing reports
-                    )
-                    
-                    report.estimated_cost = cost
-                    updated_count += 1
-                    
-                    print(f"  ✓ {report.tracking_number}: ₦{cost:,} ({report.damage_type}, severity: {report.severity_score})")
+            updates = []
+            for report in rows:
+                # Calculate cost based on existing data
+                cost = estimate_repair_cost(
+                    report.damage_type or 'unknown',
+                    report.severity_score or 0,
+                    1  # Assume 1 damage for existing reports
+                )
+                updates.append({'id': report.id, 'cost': cost})
+                
+                print(f"  ✓ {report.tracking_number}: ₦{cost:,} ({report.damage_type}, severity: {report.severity_score})")
             
             # Commit all changes
+            updated_count = len(updates)
             if updated_count > 0:
+                # One executemany in one transaction instead of an ORM flush per object
+                db.session.execute(text("UPDATE reports SET estimated_cost = :cost WHERE id = :id"), updates)
                 db.session.commit()
                 print(f"\n✅ Updated {updated_count} reports with calculated estimated costs")
             else:
@@ -5,18 +5,24 @@ This script helps identify and fix common issues
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import time
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+# One pooled session for every check: keep-alive reuses the connection instead of a new one per request
+SESSION = requests.Session()
+SESSION.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
 def test_server_connection():
     """Test if the server is running and responding"""
     print("🔍 Testing server connection...")
     
     try:
         # Test basic connection
-        response = requests.get('http://localhost:5000/api/test', timeout=5)
+        response = SESSION.get('http://localhost:5000/api/test', timeout=5)
         if response.status_code == 200:
             print("✅ Server is running and responding")
             return True
@@ -35,7 +41,7 @@ def test_health_endpoint():
     print("\n💚 Testing health endpoint...")
     
     try:
-        response = requests.get('http://localhost:5000/api/health', timeout=5)
+        response = SESSION.get('http://localhost:5000/api/health', timeout=5)
         if response.status_code == 200:
             data = response.json()
             print("✅ Health endpoint working")
@@ -66,6 +72,12 @@ def test_database():
         if table_exists:
             print("✅ Reports table exists")
             
+            # Databases created before the index was added to the model lack it; without it
+            # the ORDER BY below scans and sorts the whole table. Same name as in database.py
+            # (tracking_number is already indexed through its UNIQUE constraint)
+            cursor.execute("CREATE INDEX IF NOT EXISTS ix_reports_created_at_id ON reports (created_at, id)")
+            conn.commit()
+            
             # Count reports
             cursor.execute("SELECT COUNT(*) FROM reports")
             count = cursor.fetchone()[0]
@@ -101,7 +113,7 @@ def test_submit_report():
     }
     
     try:
-        response = requests.post(
+        response = SESSION.post(
             'http://localhost:5000/api/submit-report',
             headers={'Content-Type': 'application/json'},
             json=test_data,
@@ -142,7 +154,7 @@ def test_track_report(tracking_number):
     print(f"\n🔍 Testing report tracking for: {tracking_number}")
     
     try:
-        response = requests.get(f'http://localhost:5000/api/track/{tracking_number}', timeout=5)
+        response = SESSION.get(f'http://localhost:5000/api/track/{tracking_number}', timeout=5)
         
         if response.status_code == 200:
             data = response.json()
@@ -161,41 +173,43 @@ def test_track_report(tracking_number):
         print(f"❌ Report tracking test failed: {e}")
         return False
 
-def test_admin_endpoints():
-    """Test admin dashboard endpoints"""
-    print("\n📊 Testing admin endpoints...")
+def test_admin_reports():
+    """Test the admin reports endpoint"""
+    print("\n📊 Testing admin reports endpoint...")
     
-    # Test reports endpoint
     try:
-        response = requests.get('http://localhost:5000/api/admin/reports', timeout=10)
+        response = SESSION.get('http://localhost:5000/api/admin/reports', timeout=10)
         if response.status_code == 200:
             data = response.json()
             reports = data.get('reports', [])
             print(f"✅ Admin reports endpoint working")
             print(f"   Found {len(reports)} reports")
+            return True
         else:
             print(f"❌ Admin reports failed: {response.status_code}")
             return False
     except Exception as e:
         print(f"❌ Admin reports test failed: {e}")
         return False
+
+def test_admin_analytics():
+    """Test the admin analytics endpoint"""
+    print("\n📊 Testing admin analytics endpoint...")
     
-    # Test analytics endpoint
     try:
-        response = requests.get('http://localhost:5000/api/admin/analytics', timeout=5)
+        response = SESSION.get('http://localhost:5000/api/admin/analytics', timeout=5)
         if response.status_code == 200:
             data = response.json()
             print(f"✅ Admin analytics endpoint working")
             print(f"   Total reports: {data.get('total_reports', 0)}")
             print(f"   Completion rate: {data.get('completion_rate', 0)}%")
+            return True
         else:
             print(f"❌ Admin analytics failed: {response.status_code}")
             return False
     except Exception as e:
         print(f"❌ Admin analytics test failed: {e}")
         return False
-    
-    return True
 
 def test_cors():
     """Test CORS configuration"""
@@ -203,7 +217,7 @@ def test_cors():
     
     try:
         # Test preflight request
-        response = requests.options(
+        response = SESSION.options(
             'http://localhost:5000/api/submit-report',
             headers={
                 'Origin': 'http://localhost:5000',
@@ -252,50 +266,50 @@ def print_troubleshooting_tips():
     print("   - Use the fixed backend and HTML files")
 
 def main():
-    print("🛣️  RoadWatch Nigeria - Debug and Test Script")
-    print("="*60)
-    
-    all_tests_passed = True
-    
-    # Run tests in order
-    if not test_server_connection():
-        all_tests_passed = False
-        print("\n❌ Server not running. Please start the backend first:")
-        print("   python fixed_backend.py")
-        return
-    
-    if not test_health_endpoint():
-        all_tests_passed = False
-    
-    if not test_database():
-        all_tests_passed = False
+    try:
+        print("🛣️  RoadWatch Nigeria - Debug and Test Script")
+        print("="*60)
     
-    if not test_cors():
-        all_tests_passed = False
+        all_tests_passed = True
     
-    # Test report submission and tracking
-    tracking_number = test_submit_report()
-    if tracking_number:
-        test_track_report(tracking_number)
-    else:
-        all_tests_passed = False
+        # Run tests in order
+        if not test_server_connection():
+            all_tests_passed = False
+            print("\n❌ Server not running. Please start the backend first:")
+            print("   python fixed_backend.py")
+            return
     
-    if not test_admin_endpoints():
-        all_tests_passed = False
+        # The remaining checks are independent network/disk round trips, so run them side by side
+        # (their output may interleave). Submit -> track stays in order: tracking needs the new number
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            checks = [pool.submit(check) for check in (
+                test_health_endpoint, test_database, test_cors, test_admin_reports, test_admin_analytics
+            )]
+            
+            tracking_number = test_submit_report()
+            if tracking_number:
+                test_track_report(tracking_number)
+            else:
+                all_tests_passed = False
+            
+            if not all([check.result() for check in checks]):
+                all_tests_passed = False
     
-    # Print results
-    print("\n" + "="*60)
-    if all_tests_passed:
-        print("🎉 ALL TESTS PASSED!")
-        print("✅ Your RoadWatch system is working correctly")
-        print()
-        print("🌐 Access your system:")
-        print("   Citizen Portal: http://localhost:5000/redo.html")
-        print("   Admin Dashboard: http://localhost:5000/admin.html")
-    else:
-        print("⚠️  SOME TESTS FAILED")
-        print("❌ Please check the issues above")
-        print_troubleshooting_tips()
+        # Print results
+        print("\n" + "="*60)
+        if all_tests_passed:
+            print("🎉 ALL TESTS PASSED!")
+            print("✅ Your RoadWatch system is working correctly")
+            print()
+            print("🌐 Access your system:")
+            print("   Citizen Portal: http://localhost:5000/redo.html")
+            print("   Admin Dashboard: http://localhost:5000/admin.html")
+        else:
+            print("⚠️  SOME TESTS FAILED")
+            print("❌ Please check the issues above")
+            print_troubleshooting_tips()
+    finally:
+        SESSION.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Script to create the indexes declared on the models for an existing database
+db.create_all() only creates missing tables, so older databases need this once
+"""
+
+import os
+import sys
+
+# Add parent directory to path to import backend modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from database import db, Report
+from integrated_backend import app
+
+def migrate_indexes():
+    """Create any model indexes that don't exist yet"""
+    with app.app_context():
+        try:
+            for index in Report.__table__.indexes:
+                index.create(bind=db.engine, checkfirst=True)
+                print(f"  ✓ {index.name}")
+            
+            print("\n✅ Indexes are up to date")
+            
+        except Exception as e:
+            print(f"❌ Error creating indexes: {e}")
+
+if __name__ == '__main__':
+    migrate_indexes()
@@ -1,7 +1,19 @@
-import cv2
 import numpy as np
+from PIL import Image
 
-def get_severity_from_bounding_box(image_path, bounding_box):
+def get_image_area(image):
+    """Total pixel area of an image path or an already-decoded array."""
+    if isinstance(image, np.ndarray):
+        return image.shape[0] * image.shape[1]
+    # Only the file header is read to get the size; no pixels are decoded
+    try:
+        with Image.open(image) as im:
+            img_width, img_height = im.size
+    except (OSError, ValueError):
+        return None
+    return img_height * img_width
+
+def get_severity_from_bounding_box(image_path, bounding_box, total_image_area=None):
     """
     Estimates the severity of a pothole based on its bounding box
     area relative to the total image area.
@@ -10,23 +22,24 @@ def get_severity_from_bounding_box(image_path, bounding_box):
     and returned its bounding box.
 
     Args:
-        image_path (str): The path to the user-uploaded image.
+        image_path (str | np.ndarray): The path to the user-uploaded image,
+                              or the image already loaded as an array.
         bounding_box (tuple): A (x, y, w, h) tuple from the ML model.
                               (x, y) = top-left corner
                               (w, h) = width, height in pixels
+        total_image_area (int): Optional precomputed area, so several boxes
+                              on the same image only look it up once.
 
     Returns:
         str: "Minor", "Moderate", or "Severe"
     """
     
-    # 1. Load the image to get its total area
-    img = cv2.imread(image_path)
-    if img is None:
+    # 1. Get the total image area
+    if total_image_area is None:
+        total_image_area = get_image_area(image_path)
+    if not total_image_area:
         print(f"Error: Could not read image at {image_path}")
         return "Not Assessed"
-    
-    img_height, img_width, _ = img.shape
-    total_image_area = img_height * img_width
 
     # 2. Get the area of the bounding box
     x, y, w, h = bounding_box
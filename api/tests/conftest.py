@@ -0,0 +1,75 @@
+"""
+Shared fixtures for the API tests (test_api_*.py).
+They run the app through Flask's test client against a throwaway SQLite database and upload folder,
+so no backend server or AI provider is needed:
+    python -m pytest -q api/tests/test_api_*.py
+"""
+
+import io
+import os
+import sys
+import tempfile
+from datetime import datetime
+
+import pytest
+from PIL import Image
+
+_TMP = tempfile.mkdtemp(prefix='roadwatch-tests-')
+os.environ['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(_TMP, 'test.db')}"
+os.environ['UPLOAD_FOLDER'] = os.path.join(_TMP, 'uploads')
+os.environ['JWT_SECRET_KEY'] = 'test-secret-key-that-is-long-enough-for-hs256'
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import integrated_backend as backend
+from integrated_backend import app, db, Report, AdminUser
+
+
+@pytest.fixture(autouse=True)
+def fresh_db(monkeypatch):
+    # No AI provider in tests: background analysis becomes a no-op unless a test installs a fake pipeline
+    monkeypatch.setattr(backend, '_load_pipeline_once', lambda: None)
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+    backend.clear_track_cache()
+    backend.invalidate_analytics_cache()
+    yield
+
+
+@pytest.fixture
+def client():
+    return app.test_client()
+
+
+@pytest.fixture
+def auth(client):
+    with app.app_context():
+        user = AdminUser(username='admin', password_hash='')
+        user.set_password('pw')
+        db.session.add(user)
+        db.session.commit()
+    token = client.post('/api/admin/login', json={'username': 'admin', 'password': 'pw'}).get_json()['token']
+    return {'Authorization': f'Bearer {token}'}
+
+
+@pytest.fixture
+def add_reports():
+    def _add(n, created_at=None, **fields):
+        with app.app_context():
+            # Numbering continues across calls, so tests can mix batches with different fields
+            start = Report.query.count()
+            for i in range(start, start + n):
+                db.session.add(Report(tracking_number=f'RWTEST{i:04d}', location='Test', description='d',
+                                      created_at=created_at or datetime.utcnow(), **fields))
+            db.session.commit()
+    return _add
+
+
+@pytest.fixture
+def image_bytes():
+    def _encode(size, fmt='JPEG', mode='RGB', **save_args):
+        buf = io.BytesIO()
+        Image.new(mode, size).save(buf, fmt, **save_args)
+        return buf.getvalue()
+    return _encode
@@ -0,0 +1,47 @@
+"""Admin report list: streamed JSON body and keyset paging."""
+
+from datetime import datetime
+
+
+def test_list_is_one_streamed_json_document(client, auth, add_reports):
+    add_reports(3, image_filename='x.jpg')
+    resp = client.get('/api/admin/reports', headers=auth)
+    assert resp.status_code == 200
+    assert resp.is_streamed
+    body = resp.get_json()
+    assert set(body) == {'reports', 'next_cursor'}
+    assert [r['id'] for r in body['reports']] == [3, 2, 1]
+    assert body['reports'][0]['photo_url'].endswith('/api/uploads/x.jpg')
+
+
+def test_empty_list(client, auth):
+    assert client.get('/api/admin/reports', headers=auth).get_json() == {'reports': [], 'next_cursor': None}
+
+
+def test_list_requires_token(client):
+    assert client.get('/api/admin/reports').status_code == 401
+
+
+# --- KEYSET PAGING ---
+
+def test_keyset_paging_with_tied_timestamps(client, auth, add_reports):
+    add_reports(5, created_at=datetime(2025, 1, 1, 12, 0, 0))
+
+    pages, cursor = [], None
+    while True:
+        query = {'limit': 2, **({'cursor': cursor} if cursor else {})}
+        body = client.get('/api/admin/reports', query_string=query, headers=auth).get_json()
+        pages.append([r['id'] for r in body['reports']])
+        cursor = body['next_cursor']
+        if not cursor: break
+
+    assert pages == [[5, 4], [3, 2], [1]]
+
+
+def test_unpaged_list_has_no_cursor(client, auth, add_reports):
+    add_reports(3)
+    assert client.get('/api/admin/reports', headers=auth).get_json()['next_cursor'] is None
+
+
+def test_invalid_cursor_is_rejected(client, auth):
+    assert client.get('/api/admin/reports?limit=2&cursor=garbage', headers=auth).status_code == 400
@@ -0,0 +1,88 @@
+"""Background analysis: stored results for re-submitted photos."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+import integrated_backend as backend
+from integrated_backend import app, db, Report, AnalysisCache
+
+
+class FakePipeline:
+    def __init__(self, model_id='road-damage/1'):
+        self.model_id = model_id
+        self.calls = 0
+
+    def analyze_image(self, image_path, image_data=None):
+        self.calls += 1
+        return {'status': 'no_damage'}
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    fake = FakePipeline()
+    monkeypatch.setattr(backend, '_load_pipeline_once', lambda: fake)
+    return fake
+
+
+@pytest.fixture
+def photo(tmp_path, image_bytes):
+    path = tmp_path / 'photo.jpg'
+    path.write_bytes(image_bytes((32, 32)))
+    return str(path)
+
+
+def analyse(photo, n=1, **kwargs):
+    for report_id in range(1, n + 1):
+        backend.process_ai_background(report_id, photo, **kwargs)
+
+
+def test_resubmitted_photo_reuses_analysis(pipeline, photo, add_reports):
+    add_reports(2)
+    analyse(photo, n=2)
+    assert pipeline.calls == 1
+    with app.app_context():
+        assert [r.status for r in Report.query.order_by(Report.id)] == ['completed', 'completed']
+        assert AnalysisCache.query.count() == 1
+
+
+def test_reprocess_bypasses_and_refreshes_cache(pipeline, photo, add_reports):
+    add_reports(1)
+    analyse(photo)
+    with app.app_context():
+        first = AnalysisCache.query.one().created_at
+
+    analyse(photo, use_cache=False)
+    assert pipeline.calls == 2
+    with app.app_context():
+        assert AnalysisCache.query.one().created_at > first
+
+
+def test_expired_analysis_is_not_reused(pipeline, photo, add_reports):
+    add_reports(1)
+    analyse(photo)
+    with app.app_context():
+        AnalysisCache.query.update({'created_at': datetime.utcnow() - backend.ANALYSIS_CACHE_TTL - timedelta(days=1)})
+        db.session.commit()
+
+    analyse(photo)
+    assert pipeline.calls == 2
+
+
+def test_model_change_misses_cache(pipeline, photo, add_reports):
+    add_reports(1)
+    analyse(photo)
+    pipeline.model_id = 'road-damage/2'
+    analyse(photo)
+    assert pipeline.calls == 2
+    with app.app_context():
+        assert AnalysisCache.query.count() == 2
+
+
+def test_provider_errors_are_not_cached(pipeline, photo, add_reports, monkeypatch):
+    add_reports(1)
+    monkeypatch.setattr(pipeline, 'analyze_image',
+                        lambda *args: {'status': 'completed', 'message': 'provider unavailable', 'summary': {}})
+    analyse(photo)
+    with app.app_context():
+        assert AnalysisCache.query.count() == 0
@@ -0,0 +1,48 @@
+"""Admin analytics: counters from the grouped aggregate query."""
+
+
+def analytics(client, auth):
+    resp = client.get('/api/admin/analytics', headers=auth)
+    assert resp.status_code == 200
+    return resp.get_json()
+
+
+def test_empty_database(client, auth):
+    body = analytics(client, auth)
+    assert body['total_reports'] == 0
+    assert body['completion_rate'] == 0
+    assert body['severity_distribution'] == {'high': 0, 'medium': 0, 'low': 0, 'none': 0}
+
+
+def test_distributions_and_completion_rate(client, auth, add_reports):
+    add_reports(2, status='completed', damage_type='pothole', severity_score=85)
+    add_reports(1, status='completed', damage_type='none', severity_score=0)
+    add_reports(1, status='under_review', damage_type='crack', severity_score=50)
+    add_reports(1, status='under_review', damage_type='crack', severity_score=10)
+    add_reports(3)  # still processing: unscored
+
+    body = analytics(client, auth)
+    assert body['total_reports'] == 8
+    assert body['completed_reports'] == 3
+    assert body['completion_rate'] == 37.5
+    assert body['high_severity_reports'] == 2
+    assert body['severity_distribution'] == {'high': 2, 'medium': 1, 'low': 1, 'none': 4}
+    assert body['status_distribution'] == {'completed': 3, 'under_review': 2, 'submitted': 3}
+    assert body['damage_type_distribution'] == {'pothole': 2, 'none': 1, 'crack': 2, 'processing': 3}
+
+
+def test_severity_band_edges(client, auth, add_reports):
+    for score in (70, 69, 30, 29, 1, 0):
+        add_reports(1, severity_score=score)
+    assert analytics(client, auth)['severity_distribution'] == {'high': 1, 'medium': 2, 'low': 2, 'none': 1}
+
+
+def test_status_update_refreshes_cached_analytics(client, auth, add_reports):
+    add_reports(1)
+    assert analytics(client, auth)['completed_reports'] == 0
+    client.post('/api/admin/update-status', json={'report_id': 1, 'status': 'completed'}, headers=auth)
+    assert analytics(client, auth)['completed_reports'] == 1
+
+
+def test_analytics_requires_token(client):
+    assert client.get('/api/admin/analytics').status_code == 401
@@ -0,0 +1,63 @@
+"""Admin login: argon2 hashing, the legacy werkzeug hash upgrade and the JWT claims cache."""
+
+from werkzeug.security import generate_password_hash
+
+import integrated_backend as backend
+from integrated_backend import app, db, AdminUser
+
+
+def add_admin(password_hash):
+    with app.app_context():
+        db.session.add(AdminUser(username='admin', password_hash=password_hash))
+        db.session.commit()
+
+
+def stored_hash():
+    with app.app_context():
+        return AdminUser.query.filter_by(username='admin').one().password_hash
+
+
+def login(client, password):
+    return client.post('/api/admin/login', json={'username': 'admin', 'password': password})
+
+
+def test_legacy_hash_is_upgraded_to_argon2(client):
+    add_admin(generate_password_hash('pw'))
+    assert login(client, 'pw').status_code == 200
+    assert stored_hash().startswith('$argon2')
+    # The upgraded hash still verifies
+    assert login(client, 'pw').status_code == 200
+
+
+def test_wrong_password_keeps_legacy_hash(client):
+    legacy = generate_password_hash('pw')
+    add_admin(legacy)
+    assert login(client, 'nope').status_code == 401
+    assert stored_hash() == legacy
+
+
+def test_repeated_login_is_verified_every_time(client):
+    with app.app_context():
+        user = AdminUser(username='admin', password_hash='')
+        user.set_password('pw')
+        db.session.add(user)
+        db.session.commit()
+    assert login(client, 'pw').status_code == 200
+    assert login(client, 'nope').status_code == 401
+    assert login(client, 'pw').status_code == 200
+
+
+# --- CLAIMS CACHE ---
+
+def test_repeated_token_hits_claims_cache(client, auth, monkeypatch):
+    from flask_jwt_extended import JWTManager
+    backend.jwt._claims_cache.clear()
+    decoded = []
+    original = JWTManager._decode_jwt_from_config
+    monkeypatch.setattr(JWTManager, '_decode_jwt_from_config',
+                        lambda self, *args, **kwargs: decoded.append(1) or original(self, *args, **kwargs))
+
+    for _ in range(3):
+        assert client.get('/api/admin/reports', headers=auth).status_code == 200
+    assert len(decoded) == 1
+    assert len(backend.jwt._claims_cache) == 1
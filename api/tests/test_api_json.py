@@ -0,0 +1,14 @@
+"""JSON encoding through the orjson provider."""
+
+from integrated_backend import app
+
+
+def test_non_string_keys_are_stringified():
+    assert app.json.dumps({1: 'a', 2.5: 'b'}) == '{"1":"a","2.5":"b"}'
+
+
+def test_budget_allocations_keyed_by_numeric_tracking_number(client):
+    repair = {'tracking_number': 42, 'severity_score': 80, 'damage_type': 'pothole', 'status': 'submitted'}
+    resp = client.post('/api/budget/optimize', json={'repairs': [repair], 'total_budget': 10_000_000})
+    assert resp.status_code == 200
+    assert list(resp.get_json()['allocations']) == ['42']
@@ -0,0 +1,38 @@
+"""Admin status updates: single report and set-based bulk updates."""
+
+import integrated_backend as backend
+from integrated_backend import app, Report
+
+
+def test_bulk_status_update_by_id_and_tracking_number(client, auth, add_reports):
+    add_reports(4)
+    resp = client.post('/api/admin/update-status', headers=auth,
+                       json={'report_ids': [1, '2', 'RWTEST0002', 999], 'status': 'scheduled'})
+    body = resp.get_json()
+    assert resp.status_code == 200
+    assert body['updated'] == 3 and body['not_found'] == 1
+    with app.app_context():
+        statuses = {r.id: r.status for r in Report.query.all()}
+    assert statuses == {1: 'scheduled', 2: 'scheduled', 3: 'scheduled', 4: 'submitted'}
+
+
+def test_bulk_status_update_spans_chunks(add_reports):
+    add_reports(7)
+    with app.app_context():
+        requested, updated = backend.bulk_update_status(list(range(1, 8)), 'completed', chunk_size=3)
+        assert (requested, updated) == (7, 7)
+        assert Report.query.filter_by(status='completed').count() == 7
+
+
+def test_single_status_update(client, auth, add_reports):
+    add_reports(1)
+    resp = client.post('/api/admin/update-status', headers=auth, json={'report_id': 'RWTEST0000', 'status': 'in_progress'})
+    assert resp.get_json()['status'] == 'in_progress'
+    assert client.post('/api/admin/update-status', headers=auth, json={'report_id': 42, 'status': 'scheduled'}).status_code == 404
+
+
+def test_status_update_validation(client, auth, add_reports):
+    add_reports(1)
+    assert client.post('/api/admin/update-status', headers=auth, json={'report_ids': [1], 'status': 'bogus'}).status_code == 400
+    assert client.post('/api/admin/update-status', headers=auth, json={'report_ids': 'x', 'status': 'scheduled'}).status_code == 400
+    assert client.post('/api/admin/update-status', json={'report_ids': [1], 'status': 'scheduled'}).status_code == 401
@@ -0,0 +1,60 @@
+"""Public tracking endpoint and its response caches."""
+
+import integrated_backend as backend
+from integrated_backend import app, db, Report
+
+TN = 'RWTEST0000'
+
+
+def track(client):
+    return client.get(f'/api/track/{TN}')
+
+
+def set_status_behind_cache(status):
+    # Writes straight to the table, so only the cache can explain a stale response
+    with app.app_context():
+        Report.query.filter_by(tracking_number=TN).update({'status': status})
+        db.session.commit()
+
+
+def test_track_payload(client, add_reports):
+    add_reports(1)
+    body = track(client).get_json()
+    assert body['tracking_number'] == TN
+    assert body['status'] == 'submitted'
+    assert client.get('/api/track/RWNOPE').status_code == 404
+
+
+def test_track_response_is_cached(client, add_reports):
+    add_reports(1)
+    track(client)
+    set_status_behind_cache('in_progress')
+    assert track(client).get_json()['status'] == 'submitted'
+
+
+def test_status_update_invalidates_cached_track(client, auth, add_reports):
+    add_reports(1)
+    track(client)
+    client.post('/api/admin/update-status', json={'report_id': TN, 'status': 'in_progress'}, headers=auth)
+    assert track(client).get_json()['status'] == 'in_progress'
+
+
+def test_bulk_update_invalidates_cached_track(client, auth, add_reports):
+    add_reports(1)
+    track(client)
+    client.post('/api/admin/update-status', json={'report_ids': [TN], 'status': 'completed'}, headers=auth)
+    assert track(client).get_json()['status'] == 'completed'
+
+
+def test_finished_reports_use_the_long_lived_cache(client, auth, add_reports):
+    add_reports(1)
+    track(client)
+    assert TN in backend._TRACK_CACHE and TN not in backend._TRACK_DONE_CACHE
+
+    client.post('/api/admin/update-status', json={'report_id': TN, 'status': 'completed'}, headers=auth)
+    track(client)
+    assert TN in backend._TRACK_DONE_CACHE and TN not in backend._TRACK_CACHE
+
+    # Reopening a finished report still drops it from the long-lived cache
+    client.post('/api/admin/update-status', json={'report_id': TN, 'status': 'in_progress'}, headers=auth)
+    assert track(client).get_json()['status'] == 'in_progress'
@@ -0,0 +1,135 @@
+"""Report photo uploads: size and pixel limits, downscaling, multipart and JSON submission."""
+
+import base64
+import io
+import os
+
+import pytest
+from PIL import Image
+
+import integrated_backend as backend
+from integrated_backend import app, Report
+
+
+def submit(client, photo, name='a.jpg', **fields):
+    return client.post('/api/submit-report-multipart', data={'location': 'X', **fields, 'photo': (io.BytesIO(photo), name)})
+
+
+# --- UPLOAD LIMITS ---
+
+def test_photo_over_byte_limit_is_413(client, monkeypatch):
+    monkeypatch.setattr(backend, 'MAX_PHOTO_BYTES', 1000)
+    assert submit(client, b'\0' * 1001).status_code == 413
+
+
+def test_body_over_content_length_is_413(client):
+    assert submit(client, b'\0' * (app.config['MAX_CONTENT_LENGTH'] + 1)).status_code == 413
+
+
+def test_base64_photo_over_limit_is_413(client, monkeypatch):
+    # Refused on the base64 length, before anything is decoded
+    monkeypatch.setattr(backend, 'MAX_PHOTO_BYTES', 1000)
+    assert client.post('/api/submit-report', json={'location': 'X', 'photo': 'A' * 1400}).status_code == 413
+
+
+@pytest.mark.parametrize('side', [6000, 15000])
+def test_pixel_bombs_are_413(client, image_bytes, side):
+    # 6000x6000 trips our own pixel check; 15000x15000 trips PIL's DecompressionBombError first
+    resp = submit(client, image_bytes((side, side), 'PNG', mode='1'), 'a.png')
+    assert resp.status_code == 413
+    with app.app_context():
+        assert Report.query.count() == 0
+
+
+def test_undecodable_photo_is_not_linked(client):
+    assert submit(client, b'junk').status_code == 200
+    with app.app_context():
+        assert Report.query.one().image_filename == ''
+
+
+# --- DOWNSCALING ---
+
+def stored_image(tracking_number):
+    with app.app_context():
+        report = Report.query.filter_by(tracking_number=tracking_number).one()
+        return Image.open(os.path.join(app.config['UPLOAD_FOLDER'], report.image_filename))
+
+
+def test_large_photos_are_downscaled(client, image_bytes):
+    resp = submit(client, image_bytes((3000, 2000), 'PNG'), 'a.png')
+    with stored_image(resp.get_json()['tracking_number']) as stored:
+        assert stored.size == (backend.MAX_IMAGE_SIDE, 853)
+
+
+def test_exif_rotation_is_applied_before_downscaling(client, image_bytes):
+    exif = Image.Exif()
+    exif[0x0112] = 6  # Orientation: rotate 90 degrees clockwise
+    resp = submit(client, image_bytes((3000, 2000), exif=exif))
+    with stored_image(resp.get_json()['tracking_number']) as stored:
+        assert stored.size == (853, backend.MAX_IMAGE_SIDE)
+
+
+# --- MULTIPART SUBMISSION ---
+
+def test_multipart_submit_stores_small_jpeg(client, image_bytes):
+    photo = image_bytes((64, 48))
+    resp = submit(client, photo, description='Pothole', gps_coordinates='{"lat": 6.5, "lng": 3.3}')
+    assert resp.status_code == 202
+    with app.app_context():
+        report = Report.query.filter_by(tracking_number=resp.get_json()['tracking_number']).one()
+        assert report.gps_latitude == 6.5 and report.gps_detected and report.description == 'Pothole'
+        with open(os.path.join(app.config['UPLOAD_FOLDER'], report.image_filename), 'rb') as f:
+            assert f.read() == photo
+
+
+def test_multipart_submit_without_photo(client):
+    resp = client.post('/api/submit-report-multipart', data={'location': 'X'})
+    assert resp.status_code == 200
+
+
+@pytest.mark.parametrize('gps', ['[6.5, 3.4]', '"x"', 'not json'])
+def test_multipart_submit_rejects_non_object_gps(client, gps):
+    assert client.post('/api/submit-report-multipart', data={'location': 'X', 'gps_coordinates': gps}).status_code == 400
+
+
+def test_json_submit_still_supported(client, image_bytes):
+    photo = 'data:image/jpeg;base64,' + base64.b64encode(image_bytes((64, 48))).decode()
+    assert client.post('/api/submit-report', json={'location': 'X', 'photo': photo}).status_code == 202
+    assert client.post('/api/submit-report', json={'location': 'X', 'gps_coordinates': [1, 2]}).status_code == 400
+    assert client.post('/api/submit-report', json=[1, 2]).status_code == 400
+
+
+# --- METADATA STRIPPING ---
+
+def gps_exif(orientation=1):
+    exif = Image.Exif()
+    exif[0x010F] = 'PhoneMaker'   # Make
+    exif[0x0112] = orientation
+    exif[0x8825] = {1: 'N', 2: (6.0, 31.0, 0.0), 3: 'E', 4: (3.0, 22.0, 0.0)}  # GPSInfo
+    return exif
+
+
+def test_small_jpeg_is_stored_without_exif(client, image_bytes):
+    photo = image_bytes((64, 48), exif=gps_exif(), quality=90)
+    resp = submit(client, photo)
+    with stored_image(resp.get_json()['tracking_number']) as stored:
+        assert 'exif' not in stored.info
+        assert not stored.getexif()
+        with open(stored.filename, 'rb') as f:
+            assert b'PhoneMaker' not in f.read()
+        # The compressed image data itself is untouched
+        with Image.open(io.BytesIO(photo)) as original:
+            assert stored.tobytes() == original.tobytes()
+
+
+def test_rotated_small_jpeg_is_stored_upright_without_exif(client, image_bytes):
+    resp = submit(client, image_bytes((64, 48), exif=gps_exif(orientation=6)))
+    with stored_image(resp.get_json()['tracking_number']) as stored:
+        assert stored.size == (48, 64)
+        assert not stored.getexif()
+
+
+def test_downscaled_jpeg_is_stored_without_exif(client, image_bytes):
+    resp = submit(client, image_bytes((3000, 2000), exif=gps_exif()))
+    with stored_image(resp.get_json()['tracking_number']) as stored:
+        assert not stored.getexif()
@@ -1070,28 +1070,25 @@ async function scheduleSelected() {
         let successCount = 0;
         let errorCount = 0;
 
-        for (const reportId of reportIds) {
-            try {
-                const response = await fetch(`${API_BASE_URL}/api/admin/update-status`, {
-                    method: 'POST',
-                    headers: {
-                        'Content-Type': 'application/json',
-                        ...getAuthHeader()
-                    },
-                    body: JSON.stringify({
-                        report_id: String(reportId),
-                        status: 'scheduled'
-                    })
-                });
+        // One request for the whole selection instead of one per report
+        const response = await fetch(`${API_BASE_URL}/api/admin/update-status`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                ...getAuthHeader()
+            },
+            body: JSON.stringify({
+                report_ids: reportIds.map(String),
+                status: 'scheduled'
+            })
+        });
 
-                if (response.ok) {
-                    successCount++;
-                } else {
-                    errorCount++;
-                }
-            } catch (err) {
-                errorCount++;
-            }
+        const data = await response.json();
+        if (response.ok) {
+            successCount = data.updated;
+            errorCount = data.not_found;
+        } else {
+            errorCount = reportIds.length;
         }
 
         if (successCount > 0) {
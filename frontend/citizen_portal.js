@@ -288,28 +288,20 @@ async function handleReportSubmit(e) {
         const photoFile = document.getElementById('photoInput').files[0];
         if (!photoFile) throw new Error('Please select a photo');
 
-        const reader = new FileReader();
-        const photoBase64 = await new Promise((resolve, reject) => {
-            reader.onload = () => resolve(reader.result);
-            reader.onerror = reject;
-            reader.readAsDataURL(photoFile);
-        });
-
-        const payload = {
-            location: `${location}, ${lga} LGA, Lagos`,
-            lga: lga,
-            state: 'Lagos',
-            description: document.getElementById('description').value,
-            contact: document.getElementById('phone').value,
-            photo: photoBase64,
-            gps_coordinates: gpsCoordinates,
-            size: damageSize // Include size in payload
-        };
-
-        const response = await fetch(`${API_BASE_URL}/api/submit-report`, {
+        // Send the photo as a raw file part; base64 in JSON made the upload a third larger
+        const formData = new FormData();
+        formData.append('location', `${location}, ${lga} LGA, Lagos`);
+        formData.append('lga', lga);
+        formData.append('state', 'Lagos');
+        formData.append('description', document.getElementById('description').value);
+        formData.append('contact', document.getElementById('phone').value);
+        formData.append('photo', photoFile);
+        if (gpsCoordinates) formData.append('gps_coordinates', JSON.stringify(gpsCoordinates));
+        formData.append('size', damageSize); // Include size in payload
+
+        const response = await fetch(`${API_BASE_URL}/api/submit-report-multipart`, {
             method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify(payload)
+            body: formData
         });
 
         const result = await response.json();
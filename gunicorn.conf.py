@@ -0,0 +1,34 @@
+# Gunicorn settings for the RoadWatch backend (picked up automatically by start.sh)
+import os
+
+# --- WORKERS ---
+# One process by default (as before): caches, the AI executor and the pipeline are per process, and
+# cpu_count() inside a container reports the host's cores. Scale out explicitly with WEB_CONCURRENCY.
+# Inference runs on Roboflow, so the threads are mostly waiting on I/O
+workers = int(os.environ.get('WEB_CONCURRENCY', 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+worker_class = 'gthread'
+timeout = 120
+keepalive = 30
+
+# Import the app once in the master; workers fork from it and share its memory
+preload_app = True
+
+
+def when_ready(server):
+    # Load the AI pipeline before forking so every worker inherits it
+    from api.integrated_backend import _load_pipeline_once
+    _load_pipeline_once()
+
+
+def post_fork(server, worker):
+    # Connections opened by the master (db.create_all at import) must not be shared across processes
+    from api.integrated_backend import app, db
+    with app.app_context():
+        db.engine.dispose(close=False)
+
+
+def post_worker_init(worker):
+    # Without preload_app, warm the pipeline in each worker so the first report doesn't pay the load cost
+    from api.integrated_backend import _load_pipeline_once
+    _load_pipeline_once()
@@ -4,4 +4,5 @@ set -o errexit
 
 # Run Gunicorn. The module is 'api.integrated_backend' 
 # and the Flask application object is named 'app'.
-gunicorn api.integrated_backend:app --workers 1 --threads 4 --timeout 120
\ No newline at end of file
+# Workers, threads and timeouts are set in gunicorn.conf.py.
+gunicorn api.integrated_backend:app